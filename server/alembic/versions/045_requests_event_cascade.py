@@ -0,0 +1,46 @@
+"""requests.event_id ON DELETE CASCADE
+
+requests was the last event child table whose FK to events lacked ON
+DELETE CASCADE. Bring it in line with now_playing, play_history and
+guest_profiles so the database removes an event's requests (and, via
+request_votes.request_id, their votes) when the event row is deleted.
+The ORM relationships are marked passive_deletes=True to match.
+
+Revision ID: 045
+Revises: 044
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "045"
+down_revision: str | None = "044"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CONSTRAINT_NAME = "requests_event_id_fkey"
+
+
+def upgrade() -> None:
+    op.drop_constraint(CONSTRAINT_NAME, "requests", type_="foreignkey")
+    op.create_foreign_key(
+        CONSTRAINT_NAME,
+        "requests",
+        "events",
+        ["event_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(CONSTRAINT_NAME, "requests", type_="foreignkey")
+    op.create_foreign_key(
+        CONSTRAINT_NAME,
+        "requests",
+        "events",
+        ["event_id"],
+        ["id"],
+    )
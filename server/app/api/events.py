@@ -77,10 +77,10 @@ from app.services.event import (
 )
 from app.services.event_bus import publish_event
 from app.services.export import (
-    export_play_history_to_csv,
-    export_requests_to_csv,
     generate_export_filename,
     generate_play_history_export_filename,
+    iter_play_history_csv,
+    iter_requests_csv,
 )
 from app.services.now_playing import (
     get_manual_hide_setting,
@@ -572,12 +572,10 @@ def export_event_csv(
     # Get all requests for the event (no status filter, limited for safety)
     requests = get_requests_for_event(db, event, status=None, since=None, limit=MAX_EXPORT_REQUESTS)
 
-    # Generate CSV content
-    csv_content = export_requests_to_csv(event, requests)
     filename = generate_export_filename(event)
 
     return StreamingResponse(
-        iter([csv_content]),
+        iter_requests_csv(event, requests),
         media_type="text/csv",
         headers={"Content-Disposition": _content_disposition(filename)},
     )
@@ -594,12 +592,10 @@ def export_play_history_csv(
     # Get all play history entries for the event (limited for safety)
     history_items, _ = get_play_history(db, event.id, limit=MAX_EXPORT_PLAY_HISTORY, offset=0)
 
-    # Generate CSV content
-    csv_content = export_play_history_to_csv(event, history_items)
     filename = generate_play_history_export_filename(event)
 
     return StreamingResponse(
-        iter([csv_content]),
+        iter_play_history_csv(event, history_items),
         media_type="text/csv",
         headers={"Content-Disposition": _content_disposition(filename)},
     )
@@ -71,9 +71,11 @@ class Event(Base):
 
     created_by: Mapped["User"] = relationship("User", back_populates="events")
     requests: Mapped[list["Request"]] = relationship(
-        "Request", back_populates="event", foreign_keys="Request.event_id"
+        "Request", back_populates="event", foreign_keys="Request.event_id", passive_deletes=True
+    )
+    play_history: Mapped[list["PlayHistory"]] = relationship(
+        "PlayHistory", back_populates="event", passive_deletes=True
     )
-    play_history: Mapped[list["PlayHistory"]] = relationship("PlayHistory", back_populates="event")
 
     @property
     def phase(self) -> Literal["pre_announce", "collection", "live", "closed"]:
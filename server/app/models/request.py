@@ -36,7 +36,7 @@ class Request(Base):
     __tablename__ = "requests"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), index=True)
     song_title: Mapped[str] = mapped_column(String(255))
     artist: Mapped[str] = mapped_column(String(255))
     source: Mapped[str] = mapped_column(String(20), default=RequestSource.MANUAL.value)
@@ -78,5 +78,5 @@ class Request(Base):
         "Event", back_populates="requests", foreign_keys=[event_id]
     )
     votes: Mapped[list["RequestVote"]] = relationship(
-        "RequestVote", back_populates="request", cascade="all, delete-orphan"
+        "RequestVote", back_populates="request", cascade="all, delete-orphan", passive_deletes=True
     )
@@ -3,7 +3,7 @@ import string
 from datetime import datetime, timedelta
 from enum import Enum
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.time import utcnow
@@ -119,10 +119,13 @@ def get_event_by_code_for_owner(db: Session, code: str, user: User) -> Event | N
 def delete_event(db: Session, event: Event) -> None:
     """Delete an event and all its associated data.
 
-    Deletes in FK-safe order to avoid constraint violations:
+    Every child table declares ON DELETE CASCADE, so on PostgreSQL deleting
+    the event row is enough. Child rows are still bulk-deleted first, in
+    FK-safe order, because SQLite (used by the test suite) does not enforce
+    FK cascades:
     1. Clean up banner files
-    2. Bulk-delete child records (requests cascade-delete votes at DB level)
-    3. Delete event (DB cascades delete play_history and now_playing)
+    2. Bulk-delete child records (votes via a subquery, no ID round-trip)
+    3. Delete the event row
     """
     from app.models.now_playing import NowPlaying
     from app.models.play_history import PlayHistory
@@ -138,11 +141,10 @@ def delete_event(db: Session, event: Event) -> None:
     db.query(NowPlaying).filter(NowPlaying.event_id == event_id).delete(synchronize_session=False)
     db.query(PlayHistory).filter(PlayHistory.event_id == event_id).delete(synchronize_session=False)
     # Delete votes before requests (SQLite doesn't enforce FK cascades)
-    request_ids = [r[0] for r in db.query(Request.id).filter(Request.event_id == event_id).all()]
-    if request_ids:
-        db.query(RequestVote).filter(RequestVote.request_id.in_(request_ids)).delete(
-            synchronize_session=False
-        )
+    event_request_ids = select(Request.id).where(Request.event_id == event_id)
+    db.query(RequestVote).filter(RequestVote.request_id.in_(event_request_ids)).delete(
+        synchronize_session=False
+    )
     db.query(Request).filter(Request.event_id == event_id).delete(synchronize_session=False)
 
     # Expunge event from session to skip ORM relationship processing,
@@ -6,11 +6,17 @@ Subscribers are asyncio.Queue instances.
 
 import asyncio
 import logging
+import re
 from collections import defaultdict
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Event codes are uppercase alphanumerics of at most 10 chars (Event.code is
+# String(10)); anything else can never have subscribers, so reject it before
+# hashing into _channels.
+_CODE_RE = re.compile(r"\A[A-Z0-9_]{1,10}\Z")
+
 
 class EventBus:
     """Process-local pub/sub for broadcasting events to SSE subscribers."""
@@ -37,7 +43,10 @@ class EventBus:
 
         Non-blocking: drops messages for full queues (slow consumers).
         Safe to call from sync code via the module-level helper.
+        Malformed event codes are ignored without touching the channel map.
         """
+        if not _CODE_RE.match(event_code):
+            return
         message = {"event": event_type, "data": data or {}}
         subscribers = self._channels.get(event_code, set())
         for queue in subscribers:
@@ -3,6 +3,7 @@
 import csv
 import io
 import re
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
 
 from app.models.event import Event
@@ -25,6 +26,19 @@ def sanitize_csv_value(value: str | None) -> str:
     return value
 
 
+def _iter_csv_lines(header: list[str], rows: Iterable[list]) -> Iterator[str]:
+    """Yield a CSV document one line at a time, reusing a single buffer."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
 def sanitize_filename(name: str) -> str:
     """Sanitize a string for use in a filename."""
     # Remove or replace characters that are problematic in filenames
@@ -42,6 +56,60 @@ def generate_export_filename(event: Event) -> str:
     return f"{event.code}_{sanitized_name}_{date_str}.csv"
 
 
+REQUESTS_CSV_HEADER = [
+    "Request ID",
+    "Song Title",
+    "Artist",
+    "Genre",
+    "BPM",
+    "Key",
+    "Votes",
+    "Status",
+    "Note",
+    "Source",
+    "Source URL",
+    "Artwork URL",
+    "Created At",
+    "Updated At",
+]
+
+
+def iter_requests_csv(event: Event, requests: Iterable[Request]) -> Iterator[str]:
+    """
+    Export song requests to CSV format, one line at a time.
+
+    Suitable for passing straight to a StreamingResponse.
+
+    Args:
+        event: The event the requests belong to
+        requests: Requests to export
+
+    Yields:
+        The header line, then one CSV line per request
+    """
+    # Data rows are sanitized to prevent CSV formula injection
+    rows = (
+        [
+            req.id,
+            sanitize_csv_value(req.song_title),
+            sanitize_csv_value(req.artist),
+            sanitize_csv_value(req.genre),
+            req.bpm if req.bpm is not None else "",
+            sanitize_csv_value(req.musical_key),
+            req.vote_count if req.vote_count is not None else 0,
+            req.status,
+            sanitize_csv_value(req.note),
+            sanitize_csv_value(req.source),
+            sanitize_csv_value(req.source_url),
+            sanitize_csv_value(req.artwork_url),
+            req.created_at.isoformat() if req.created_at else "",
+            req.updated_at.isoformat() if req.updated_at else "",
+        ]
+        for req in requests
+    )
+    return _iter_csv_lines(REQUESTS_CSV_HEADER, rows)
+
+
 def export_requests_to_csv(event: Event, requests: list[Request]) -> str:
     """
     Export song requests to CSV format.
@@ -53,51 +121,7 @@ def export_requests_to_csv(event: Event, requests: list[Request]) -> str:
     Returns:
         CSV content as a string
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow(
-        [
-            "Request ID",
-            "Song Title",
-            "Artist",
-            "Genre",
-            "BPM",
-            "Key",
-            "Votes",
-            "Status",
-            "Note",
-            "Source",
-            "Source URL",
-            "Artwork URL",
-            "Created At",
-            "Updated At",
-        ]
-    )
-
-    # Write data rows with sanitization to prevent CSV formula injection
-    for req in requests:
-        writer.writerow(
-            [
-                req.id,
-                sanitize_csv_value(req.song_title),
-                sanitize_csv_value(req.artist),
-                sanitize_csv_value(req.genre),
-                req.bpm if req.bpm is not None else "",
-                sanitize_csv_value(req.musical_key),
-                req.vote_count if req.vote_count is not None else 0,
-                req.status,
-                sanitize_csv_value(req.note),
-                sanitize_csv_value(req.source),
-                sanitize_csv_value(req.source_url),
-                sanitize_csv_value(req.artwork_url),
-                req.created_at.isoformat() if req.created_at else "",
-                req.updated_at.isoformat() if req.updated_at else "",
-            ]
-        )
-
-    return output.getvalue()
+    return "".join(iter_requests_csv(event, requests))
 
 
 def generate_play_history_export_filename(event: Event) -> str:
@@ -121,6 +145,48 @@ def _format_was_requested(matched_request_id: int | None) -> str:
     return "Yes" if matched_request_id is not None else "No"
 
 
+PLAY_HISTORY_CSV_HEADER = [
+    "Play Order",
+    "Title",
+    "Artist",
+    "Album",
+    "Source",
+    "Was Requested",
+    "Started At",
+    "Ended At",
+]
+
+
+def iter_play_history_csv(event: Event, history_items: Iterable[PlayHistory]) -> Iterator[str]:
+    """
+    Export play history to CSV format, one line at a time.
+
+    Suitable for passing straight to a StreamingResponse.
+
+    Args:
+        event: The event the history belongs to
+        history_items: Play history entries to export
+
+    Yields:
+        The header line, then one CSV line per entry
+    """
+    # Data rows are sanitized to prevent CSV formula injection
+    rows = (
+        [
+            item.play_order,
+            sanitize_csv_value(item.title),
+            sanitize_csv_value(item.artist),
+            sanitize_csv_value(item.album),
+            _format_source_for_display(item.source),
+            _format_was_requested(item.matched_request_id),
+            item.started_at.isoformat() if item.started_at else "",
+            item.ended_at.isoformat() if item.ended_at else "",
+        ]
+        for item in history_items
+    )
+    return _iter_csv_lines(PLAY_HISTORY_CSV_HEADER, rows)
+
+
 def export_play_history_to_csv(event: Event, history_items: list[PlayHistory]) -> str:
     """
     Export play history to CSV format.
@@ -132,36 +198,4 @@ def export_play_history_to_csv(event: Event, history_items: list[PlayHistory]) -
     Returns:
         CSV content as a string
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow(
-        [
-            "Play Order",
-            "Title",
-            "Artist",
-            "Album",
-            "Source",
-            "Was Requested",
-            "Started At",
-            "Ended At",
-        ]
-    )
-
-    # Write data rows with sanitization to prevent CSV formula injection
-    for item in history_items:
-        writer.writerow(
-            [
-                item.play_order,
-                sanitize_csv_value(item.title),
-                sanitize_csv_value(item.artist),
-                sanitize_csv_value(item.album),
-                _format_source_for_display(item.source),
-                _format_was_requested(item.matched_request_id),
-                item.started_at.isoformat() if item.started_at else "",
-                item.ended_at.isoformat() if item.ended_at else "",
-            ]
-        )
-
-    return output.getvalue()
+    return "".join(iter_play_history_csv(event, history_items))
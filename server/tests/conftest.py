@@ -1,11 +1,14 @@
 """Pytest configuration and fixtures for WrzDJ tests."""
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from datetime import timedelta
+from functools import cache
+from unittest.mock import patch
 
+import bcrypt
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -17,9 +20,10 @@ from app.models.event import Event
 from app.models.guest import Guest
 from app.models.request import Request, RequestStatus
 from app.models.user import User
-from app.services.auth import get_password_hash
+from app.services.auth import create_access_token, get_password_hash
 
-# Use SQLite in-memory for tests (fast, isolated)
+# Use SQLite in-memory for tests (fast, isolated). Each pytest-xdist worker is
+# its own process, so every worker gets a private database with no shared files.
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(
@@ -27,48 +31,132 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    join_transaction_mode="create_savepoint",
+)
 
 
-@pytest.fixture(scope="function")
-def db() -> Generator[Session, None, None]:
-    """Create a fresh database for each test."""
+# pysqlite's implicit transaction handling breaks SAVEPOINT; let SQLAlchemy
+# emit BEGIN itself so nested transactions roll back correctly. The database
+# never touches disk, so durability PRAGMAs are switched off as well.
+@event.listens_for(engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    for pragma in ("synchronous=OFF", "journal_mode=MEMORY", "temp_store=MEMORY"):
+        dbapi_connection.execute(f"PRAGMA {pragma}")
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def db_schema() -> Generator[None, None, None]:
+    """Create all tables once for the whole test session."""
     Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db(db_schema: None) -> Generator[Session, None, None]:
+    """Yield a session whose work is rolled back after each test.
+
+    The session joins an outer transaction on a dedicated connection; its
+    commits only release SAVEPOINTs, so teardown discards everything.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection)
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
-    """Create a test client with database override."""
-
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass  # Don't close the session here, let the db fixture handle it
-
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as c:
-        yield c
+@pytest.fixture(scope="session", autouse=True)
+def fast_bcrypt() -> Generator[None, None, None]:
+    """Hash passwords at bcrypt's minimum cost factor for the whole test session."""
+    gensalt = bcrypt.gensalt
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(bcrypt, "gensalt", lambda rounds=4, prefix=b"2b": gensalt(rounds, prefix))
+        yield
+
+
+@cache
+def _password_hash(password: str) -> str:
+    """Hash each fixture password once per session; bcrypt is deliberately slow."""
+    return get_password_hash(password)
+
+
+@pytest.fixture(scope="session")
+def password_hash() -> Callable[[str], str]:
+    """Return the memoized hasher so tests seeding extra users skip repeat bcrypt work."""
+    return _password_hash
+
+
+def _bearer_headers(user: User) -> dict[str, str]:
+    """Build auth headers for a user without a bcrypt round-trip through /login."""
+    token = create_access_token(data={"sub": user.username, "tv": user.token_version})
+    return {"Authorization": f"Bearer {token}"}
+
+
+# Session the get_db override hands to the app; bound per test by `client`.
+_client_db: Session | None = None
+
+
+def _override_get_db() -> Generator[Session, None, None]:
+    if _client_db is None:
+        # Ad-hoc TestClient(app) outside the `client` fixture: behave as unpatched
+        yield from get_db()
+        return
+    yield _client_db  # Don't close the session here, let the db fixture handle it
+
+
+async def _no_tidal_collection_poll() -> None:
+    """Stand-in for the lifespan's background poll loop."""
+
+
+@pytest.fixture(scope="session")
+def app_client(db_schema: None) -> Generator[TestClient, None, None]:
+    """Create one TestClient (and run the app lifespan) for the whole session.
+
+    The get_db override is installed once; tests only rebind the session it yields.
+    The Tidal collection poll loop is stubbed out: the lifespan stays open for the
+    whole run, and the real loop would poll through SessionLocal, not the test DB.
+    """
+    app.dependency_overrides[get_db] = _override_get_db
+    with patch("app.main._tidal_collection_poll_loop", _no_tidal_collection_poll):
+        with TestClient(app) as c:
+            yield c
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def client(app_client: TestClient, db: Session) -> Generator[TestClient, None, None]:
+    """Point the shared test client at this test's database session."""
+    global _client_db
+    _client_db = db
+    app_client.cookies.clear()
+    yield app_client
+    _client_db = None
+
+
 @pytest.fixture
 def test_user(db: Session) -> User:
     """Create a test user with DJ role."""
     user = User(
         username="testuser",
-        password_hash=get_password_hash("testpassword123"),
+        password_hash=_password_hash("testpassword123"),
         role="dj",
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 
@@ -77,25 +165,18 @@ def admin_user(db: Session) -> User:
     """Create an admin test user."""
     user = User(
         username="adminuser",
-        password_hash=get_password_hash("adminpassword123"),
+        password_hash=_password_hash("adminpassword123"),
         role="admin",
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 
 @pytest.fixture
-def admin_headers(client: TestClient, admin_user: User) -> dict[str, str]:
+def admin_headers(admin_user: User) -> dict[str, str]:
     """Get authentication headers for the admin user."""
-    response = client.post(
-        "/api/auth/login",
-        data={"username": "adminuser", "password": "adminpassword123"},
-    )
-    assert response.status_code == 200, f"Login failed: {response.json()}"
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+    return _bearer_headers(admin_user)
 
 
 @pytest.fixture
@@ -103,37 +184,24 @@ def pending_user(db: Session) -> User:
     """Create a pending test user."""
     user = User(
         username="pendinguser",
-        password_hash=get_password_hash("pendingpassword123"),
+        password_hash=_password_hash("pendingpassword123"),
         role="pending",
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 
 @pytest.fixture
-def pending_headers(client: TestClient, pending_user: User) -> dict[str, str]:
+def pending_headers(pending_user: User) -> dict[str, str]:
     """Get authentication headers for the pending user."""
-    response = client.post(
-        "/api/auth/login",
-        data={"username": "pendinguser", "password": "pendingpassword123"},
-    )
-    assert response.status_code == 200, f"Login failed: {response.json()}"
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+    return _bearer_headers(pending_user)
 
 
 @pytest.fixture
-def auth_headers(client: TestClient, test_user: User) -> dict[str, str]:
+def auth_headers(test_user: User) -> dict[str, str]:
     """Get authentication headers for the test user."""
-    response = client.post(
-        "/api/auth/login",
-        data={"username": "testuser", "password": "testpassword123"},
-    )
-    assert response.status_code == 200, f"Login failed: {response.json()}"
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+    return _bearer_headers(test_user)
 
 
 @pytest.fixture
@@ -146,8 +214,7 @@ def test_event(db: Session, test_user: User) -> Event:
         expires_at=utcnow() + timedelta(hours=6),
     )
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    db.flush()
     return event
 
 
@@ -170,9 +237,7 @@ def collection_requests(db: Session, test_event: Event) -> list[Request]:
         )
         db.add(r)
         rows.append(r)
-    db.commit()
-    for r in rows:
-        db.refresh(r)
+    db.flush()
     return rows
 
 
@@ -190,8 +255,7 @@ def test_guest(db: Session) -> Guest:
         ),
     )
     db.add(guest)
-    db.commit()
-    db.refresh(guest)
+    db.flush()
     return guest
 
 
@@ -207,6 +271,5 @@ def test_request(db: Session, test_event: Event) -> Request:
         dedupe_key="test_dedupe_key_12345678",
     )
     db.add(request)
-    db.commit()
-    db.refresh(request)
+    db.flush()
     return request
@@ -2,6 +2,8 @@
 
 import asyncio
 
+import pytest
+
 from app.services.event_bus import EventBus, get_event_bus, publish_event
 
 
@@ -85,6 +87,24 @@ class TestEventBus:
         # Should not raise
         bus.publish("NOEXIST", "test", {"x": 1})
 
+    @pytest.mark.parametrize("code", ["../../../etc/passwd", "bad-code", "A" * 11])
+    def test_publish_malformed_code_is_noop(self, code):
+        bus = EventBus()
+        # Subscribe to the malformed code itself so only the publish guard can
+        # keep the message out of the queue
+        q = bus.subscribe(code)
+        bus.publish(code, "x")
+        assert q.empty()
+
+    def test_publish_empty_code_is_noop(self):
+        bus = EventBus()
+        q = bus.subscribe("EVT001")
+        bus.publish("", "x")
+        assert q.empty()
+        assert "" not in bus._channels
+        bus.publish("EVT001", "x")
+        assert q.get_nowait()["event"] == "x"
+
     def test_subscriber_count_zero_for_unknown_channel(self):
         bus = EventBus()
         assert bus.subscriber_count("UNKNOWN") == 0
@@ -109,14 +129,14 @@ class TestSingleton:
 
     def test_publish_event_delivers_via_singleton(self):
         bus = get_event_bus()
-        q = bus.subscribe("SINGLETON_TEST")
+        q = bus.subscribe("SINGLETON")
         try:
-            publish_event("SINGLETON_TEST", "hello", {"msg": "world"})
+            publish_event("SINGLETON", "hello", {"msg": "world"})
             msg = q.get_nowait()
             assert msg["event"] == "hello"
             assert msg["data"]["msg"] == "world"
         finally:
-            bus.unsubscribe("SINGLETON_TEST", q)
+            bus.unsubscribe("SINGLETON", q)
 
 
 class TestSSEEndpoint:
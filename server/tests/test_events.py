@@ -1,18 +1,147 @@
 """Tests for event endpoints."""
 
+import csv
+import io
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import exists, insert, select
 from sqlalchemy.orm import Session
 
 from app.core.time import utcnow
 from app.models.event import Event
+from app.models.now_playing import NowPlaying
+from app.models.play_history import PlayHistory
 from app.models.request import Request, RequestStatus
+from app.models.request_vote import RequestVote
 from app.models.user import User
 from app.schemas.beatport import BeatportSearchResult
 from app.schemas.search import SearchResult
-from app.services.auth import get_password_hash
+from app.schemas.tidal import TidalSearchResult
+from app.services.now_playing import set_now_playing_visibility
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _no_background_enrichment():
+    """Stop submitted requests from reaching MusicBrainz/Beatport/Tidal.
+
+    TestClient runs background tasks inline, so every request submitted here
+    would otherwise try real metadata lookups. Enrichment has its own tests.
+    """
+    with patch("app.api.events.enrich_request_metadata"):
+        yield
+
+
+@pytest.fixture
+def now() -> datetime:
+    """Capture a single UTC timestamp per test for seeded rows."""
+    return utcnow()
+
+
+def _csv_rows(response: Response) -> list[list[str]]:
+    """Parse a CSV export response once into rows (header first)."""
+    return list(csv.reader(io.StringIO(response.text)))
+
+
+EventFactory = Callable[..., Event]
+PlayHistoryFactory = Callable[[list[dict]], None]
+
+
+@pytest.fixture
+def make_event(db: Session, test_user: User, now: datetime) -> EventFactory:
+    """Return a factory that adds events to the session, owned by the test user by default.
+
+    The caller flushes, so several events can be inserted in one round-trip.
+    """
+
+    def _make(
+        code: str,
+        *,
+        name: str = "Test Event",
+        owner: User | None = None,
+        expired: bool = False,
+        **fields,
+    ) -> Event:
+        expires_delta = timedelta(hours=-1) if expired else timedelta(hours=6)
+        event = Event(
+            code=code,
+            name=name,
+            created_by=owner or test_user,
+            expires_at=now + expires_delta,
+            **fields,
+        )
+        db.add(event)
+        return event
+
+    return _make
+
+
+@pytest.fixture
+def add_play_history(db: Session, test_event: Event, now: datetime) -> PlayHistoryFactory:
+    """Bulk-insert play history rows for the test event.
+
+    Each row needs at least title, artist and source; play_order follows
+    list order and both timestamps default to ``now``.
+    """
+
+    def _add(rows: list[dict]) -> None:
+        db.execute(
+            insert(PlayHistory),
+            [
+                {
+                    "event_id": test_event.id,
+                    "play_order": order,
+                    "started_at": now,
+                    "ended_at": now,
+                    **row,
+                }
+                for order, row in enumerate(rows, start=1)
+            ],
+        )
+
+    return _add
+
+
+@pytest.fixture
+def other_event(
+    db: Session, make_event: EventFactory, password_hash: Callable[[str], str]
+) -> Event:
+    """Create an event owned by another user, which the test user must not manage."""
+    other_user = User(
+        username="otheruser",
+        password_hash=password_hash("otherpassword"),
+    )
+    event = make_event("OTHER1", name="Other User Event", owner=other_user)
+    db.flush()
+    return event
+
+
+@pytest.fixture
+def expired_event(db: Session, make_event: EventFactory) -> Event:
+    """Create an event owned by the test user that expired an hour ago."""
+    event = make_event("EXPIR1", name="Expired Event", expired=True)
+    db.flush()
+    return event
+
+
+@pytest.fixture
+def archived_event(db: Session, test_event: Event, now: datetime) -> Event:
+    """Archive the test event."""
+    test_event.archived_at = now
+    db.flush()
+    return test_event
+
+
+@pytest.fixture
+def requests_closed_event(db: Session, test_event: Event) -> Event:
+    """Close the test event to new song requests."""
+    test_event.requests_open = False
+    db.flush()
+    return test_event
 
 
 class TestCreateEvent:
@@ -50,7 +179,7 @@ class TestCreateEvent:
         assert response.status_code == 201
         data = response.json()
         # Default is 6 hours
-        expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00"))
+        expires_at = datetime.fromisoformat(data["expires_at"])
         assert expires_at > datetime.now(expires_at.tzinfo)
 
 
@@ -110,9 +239,11 @@ class TestUpdateEvent:
         assert response.status_code == 200
         assert response.json()["name"] == "Updated Name"
 
-    def test_update_event_expiry(self, client: TestClient, auth_headers: dict, test_event: Event):
+    def test_update_event_expiry(
+        self, client: TestClient, auth_headers: dict, test_event: Event, now: datetime
+    ):
         """Test updating event expiry."""
-        new_expiry = (utcnow() + timedelta(hours=12)).isoformat()
+        new_expiry = (now + timedelta(hours=12)).isoformat()
         response = client.patch(
             f"/api/events/{test_event.code}",
             json={"expires_at": new_expiry},
@@ -120,10 +251,10 @@ class TestUpdateEvent:
         )
         assert response.status_code == 200
 
-    def test_update_event_no_auth(self, client: TestClient, test_event: Event):
+    def test_update_event_no_auth(self, client: TestClient):
         """Test updating event without auth fails."""
         response = client.patch(
-            f"/api/events/{test_event.code}",
+            "/api/events/NOCODE",
             json={"name": "Hacked Name"},
         )
         assert response.status_code == 401
@@ -142,31 +273,22 @@ class TestDeleteEvent:
         )
         assert response.status_code == 204
 
-        # Verify event is deleted
-        event = db.query(Event).filter(Event.code == test_event.code).first()
-        assert event is None
+        # Verify event is deleted (Core probe: no Event instance is hydrated)
+        assert db.scalar(select(Event.id).where(Event.code == test_event.code)) is None
 
     def test_delete_event_with_associated_data(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        db: Session,
+        make_event: EventFactory,
+        now: datetime,
     ):
         """Test deleting an event that has requests, votes, play history, and now_playing."""
-        from app.models.now_playing import NowPlaying
-        from app.models.play_history import PlayHistory
-        from app.models.request_vote import RequestVote
-
-        # Create event
-        event = Event(
-            code="DELME1",
-            name="Event With Data",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-        )
-        db.add(event)
-        db.flush()
-
-        # Add requests
+        # Build the whole graph through relationships so one flush inserts it
+        event = make_event("DELME1", name="Event With Data")
         req1 = Request(
-            event_id=event.id,
+            event=event,
             song_title="Stayin Alive",
             artist="Bee Gees",
             source="manual",
@@ -174,44 +296,32 @@ class TestDeleteEvent:
             dedupe_key="delme_dedupe_1",
         )
         req2 = Request(
-            event_id=event.id,
+            event=event,
             song_title="The End",
             artist="The Doors",
             source="manual",
             status=RequestStatus.PLAYED.value,
             dedupe_key="delme_dedupe_2",
         )
-        db.add_all([req1, req2])
-        db.flush()
-
-        # Add votes on requests
-        vote = RequestVote(
-            request_id=req1.id,
-        )
-        db.add(vote)
-
-        # Add now_playing record
+        vote = RequestVote(request=req1)
         now_playing = NowPlaying(
-            event_id=event.id,
+            event=event,
             title="Stayin Alive",
             artist="Bee Gees",
-            matched_request_id=req1.id,
+            matched_request=req1,
             source="stagelinq",
         )
-        db.add(now_playing)
-
-        # Add play history
         play_entry = PlayHistory(
-            event_id=event.id,
+            event=event,
             title="The End",
             artist="The Doors",
             source="manual",
-            matched_request_id=req2.id,
-            started_at=utcnow(),
+            matched_request=req2,
+            started_at=now,
             play_order=1,
         )
-        db.add(play_entry)
-        db.commit()
+        db.add_all([req1, req2, vote, now_playing, play_entry])
+        db.flush()
 
         # Capture IDs before deletion (objects become stale after delete)
         event_id = event.id
@@ -227,16 +337,21 @@ class TestDeleteEvent:
         # Expire session to force fresh reads from DB
         db.expire_all()
 
-        # Verify everything is deleted
-        assert db.query(Event).filter(Event.id == event_id).first() is None
-        assert db.query(Request).filter(Request.event_id == event_id).all() == []
-        assert db.query(NowPlaying).filter(NowPlaying.event_id == event_id).first() is None
-        assert db.query(PlayHistory).filter(PlayHistory.event_id == event_id).all() == []
-        assert db.query(RequestVote).filter(RequestVote.request_id == req1_id).all() == []
+        # Verify everything is deleted, probing every table in one query
+        remaining = db.execute(
+            select(
+                exists().where(Event.id == event_id).label("event"),
+                exists().where(Request.event_id == event_id).label("requests"),
+                exists().where(NowPlaying.event_id == event_id).label("now_playing"),
+                exists().where(PlayHistory.event_id == event_id).label("play_history"),
+                exists().where(RequestVote.request_id == req1_id).label("votes"),
+            )
+        ).one()
+        assert not any(remaining), remaining._asdict()
 
-    def test_delete_event_no_auth(self, client: TestClient, test_event: Event):
+    def test_delete_event_no_auth(self, client: TestClient):
         """Test deleting event without auth fails."""
-        response = client.delete(f"/api/events/{test_event.code}")
+        response = client.delete("/api/events/NOCODE")
         assert response.status_code == 401
 
     def test_delete_event_not_found(self, client: TestClient, auth_headers: dict):
@@ -249,81 +364,48 @@ class TestDeleteEvent:
 
 
 class TestExpiredEvents:
-    """Tests for expired event handling with 410 Gone status."""
-
-    def test_get_expired_event_returns_410(self, client: TestClient, db: Session, test_user: User):
-        """Test that getting an expired event returns 410 Gone."""
-        # Create an expired event
-        expired_event = Event(
-            code="EXPIR1",
-            name="Expired Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
-        response = client.get(f"/api/events/{expired_event.code}")
-        assert response.status_code == 410
-        assert response.json()["detail"]
-
-    def test_submit_request_to_expired_event_returns_410(
-        self, client: TestClient, db: Session, test_user: User
+    """Tests for expired and archived event handling with 410 Gone status."""
+
+    @pytest.mark.parametrize("event_fixture", ["expired_event", "archived_event"])
+    @pytest.mark.parametrize(
+        "method, path, body",
+        [
+            ("get", "/api/events/{code}", None),
+            (
+                "post",
+                "/api/events/{code}/requests",
+                {"artist": "Test Artist", "title": "Test Song"},
+            ),
+            ("get", "/api/public/events/{code}/display", None),
+        ],
+        ids=["get_event", "submit_request", "kiosk_display"],
+    )
+    def test_inactive_event_returns_410(
+        self,
+        request: pytest.FixtureRequest,
+        client: TestClient,
+        event_fixture: str,
+        method: str,
+        path: str,
+        body: dict | None,
     ):
-        """Test that submitting a request to expired event returns 410."""
-        expired_event = Event(
-            code="EXPIR2",
-            name="Expired Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
-        response = client.post(
-            f"/api/events/{expired_event.code}/requests",
-            json={"artist": "Test Artist", "title": "Test Song"},
-        )
+        """Test that public endpoints return 410 for expired and archived events."""
+        event = request.getfixturevalue(event_fixture)
+        response = client.request(method, path.format(code=event.code), json=body)
         assert response.status_code == 410
         assert response.json()["detail"]
 
     def test_owner_can_view_requests_for_expired_event(
-        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
+        self, client: TestClient, auth_headers: dict, expired_event: Event
     ):
         """Test that owner can still view requests for expired events."""
-        expired_event = Event(
-            code="EXPIR3",
-            name="Expired Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
         response = client.get(
             f"/api/events/{expired_event.code}/requests",
             headers=auth_headers,
         )
         assert response.status_code == 200
 
-    def test_kiosk_display_expired_event_returns_410(
-        self, client: TestClient, db: Session, test_user: User
-    ):
-        """Test that kiosk display for expired event returns 410."""
-        expired_event = Event(
-            code="EXPIR4",
-            name="Expired Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
-        response = client.get(f"/api/public/events/{expired_event.code}/display")
-        assert response.status_code == 410
-        assert response.json()["detail"]
-
-    def test_404_vs_410_distinction(self, client: TestClient, db: Session, test_user: User):
+    def test_404_vs_410_distinction(self, client: TestClient, expired_event: Event):
         """Test that 404 is for not found and 410 is for expired."""
         # Non-existent event should be 404
         response = client.get("/api/events/NOEXST")
@@ -331,18 +413,9 @@ class TestExpiredEvents:
         assert response.json()["detail"]
 
         # Expired event should be 410
-        expired_event = Event(
-            code="EXPIR5",
-            name="Expired Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
         response = client.get(f"/api/events/{expired_event.code}")
         assert response.status_code == 410
-        assert response.json()["detail"]
+        assert response.json()["detail"] == "Event has expired"
 
 
 class TestArchiveEvents:
@@ -359,17 +432,17 @@ class TestArchiveEvents:
         assert data["archived_at"] is not None
         assert data["status"] == "archived"
 
-    def test_archive_event_no_auth(self, client: TestClient, test_event: Event):
+    def test_archive_event_no_auth(self, client: TestClient):
         """Test archiving without auth fails."""
-        response = client.post(f"/api/events/{test_event.code}/archive")
+        response = client.post("/api/events/NOCODE/archive")
         assert response.status_code == 401
 
     def test_archive_already_archived_event(
-        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
+        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session, now: datetime
     ):
         """Test archiving an already archived event returns 400."""
-        test_event.archived_at = utcnow()
-        db.commit()
+        test_event.archived_at = now
+        db.flush()
 
         response = client.post(
             f"/api/events/{test_event.code}/archive",
@@ -379,12 +452,12 @@ class TestArchiveEvents:
         assert response.json()["detail"]
 
     def test_unarchive_event_success(
-        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
+        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session, now: datetime
     ):
         """Test unarchiving an event."""
         # First archive it
-        test_event.archived_at = utcnow()
-        db.commit()
+        test_event.archived_at = now
+        db.flush()
 
         response = client.post(
             f"/api/events/{test_event.code}/unarchive",
@@ -405,54 +478,21 @@ class TestArchiveEvents:
         assert response.status_code == 400
         assert response.json()["detail"]
 
-    def test_get_archived_event_returns_410(
-        self, client: TestClient, test_event: Event, db: Session
-    ):
-        """Test that getting an archived event returns 410."""
-        test_event.archived_at = utcnow()
-        db.commit()
-
-        response = client.get(f"/api/events/{test_event.code}")
-        assert response.status_code == 410
-        assert response.json()["detail"]
-
-    def test_submit_request_to_archived_event_returns_410(
-        self, client: TestClient, test_event: Event, db: Session
-    ):
-        """Test that submitting to archived event returns 410."""
-        test_event.archived_at = utcnow()
-        db.commit()
-
-        response = client.post(
-            f"/api/events/{test_event.code}/requests",
-            json={"artist": "Test Artist", "title": "Test Song"},
-        )
-        assert response.status_code == 410
-        assert response.json()["detail"]
-
     def test_list_archived_events(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        db: Session,
+        make_event: EventFactory,
+        now: datetime,
     ):
         """Test listing archived and expired events."""
         # Create an archived event
-        archived_event = Event(
-            code="ARCHV1",
-            name="Archived Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-            archived_at=utcnow(),
-        )
-        db.add(archived_event)
+        make_event("ARCHV1", name="Archived Event", archived_at=now)
 
         # Create an expired event
-        expired_event = Event(
-            code="EXPRD1",
-            name="Expired Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
+        make_event("EXPRD1", name="Expired Event", expired=True)
+        db.flush()
 
         response = client.get("/api/events/archived", headers=auth_headers)
         assert response.status_code == 200
@@ -470,32 +510,33 @@ class TestArchiveEvents:
             assert "request_count" in event
 
     def test_archived_events_include_request_count(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        db: Session,
+        make_event: EventFactory,
+        now: datetime,
     ):
         """Test that archived events listing includes request counts."""
         # Create an archived event with requests
-        archived_event = Event(
-            code="ARCHV2",
-            name="Archived With Requests",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-            archived_at=utcnow(),
-        )
-        db.add(archived_event)
+        archived_event = make_event("ARCHV2", name="Archived With Requests", archived_at=now)
         db.flush()
 
-        # Add some requests
-        for i in range(3):
-            req = Request(
-                event_id=archived_event.id,
-                song_title=f"Song {i}",
-                artist="Artist",
-                source="manual",
-                status=RequestStatus.NEW.value,
-                dedupe_key=f"dedupe_key_{i}",
-            )
-            db.add(req)
-        db.commit()
+        # Add some requests (one executemany INSERT, no ORM instances)
+        db.execute(
+            insert(Request),
+            [
+                {
+                    "event_id": archived_event.id,
+                    "song_title": f"Song {i}",
+                    "artist": "Artist",
+                    "source": "manual",
+                    "status": RequestStatus.NEW.value,
+                    "dedupe_key": f"dedupe_key_{i}",
+                }
+                for i in range(3)
+            ],
+        )
 
         response = client.get("/api/events/archived", headers=auth_headers)
         assert response.status_code == 200
@@ -505,6 +546,7 @@ class TestArchiveEvents:
         assert archived["request_count"] == 3
 
 
+@pytest.mark.slow
 class TestCsvExport:
     """Tests for CSV export functionality."""
 
@@ -523,93 +565,53 @@ class TestCsvExport:
             dedupe_key="export_dedupe_key_123",
         )
         db.add(req)
-        db.commit()
+        db.flush()
 
         response = client.get(
             f"/api/events/{test_event.code}/export/csv",
             headers=auth_headers,
         )
         assert response.status_code == 200
-        assert response.headers["content-type"] == "text/csv; charset=utf-8"
-        assert "attachment" in response.headers["content-disposition"]
-        assert test_event.code in response.headers["content-disposition"]
+        headers = response.headers
+        assert headers["content-type"] == "text/csv; charset=utf-8"
+        disposition = headers["content-disposition"]
+        assert disposition.startswith("attachment;")
+        assert test_event.code in disposition
 
         # Verify CSV content
-        content = response.text
-        assert "Request ID" in content
-        assert "Song Title" in content
-        assert "Export Test Song" in content
-        assert "Export Artist" in content
-        assert "Test note" in content
-
-    def test_export_csv_no_auth(self, client: TestClient, test_event: Event):
+        header, *rows = _csv_rows(response)
+        assert "Request ID" in header
+        assert len(rows) == 1
+        row = dict(zip(header, rows[0]))
+        assert row["Song Title"] == "Export Test Song"
+        assert row["Artist"] == "Export Artist"
+        assert row["Note"] == "Test note"
+
+    def test_export_csv_no_auth(self, client: TestClient):
         """Test exporting without auth fails."""
-        response = client.get(f"/api/events/{test_event.code}/export/csv")
+        response = client.get("/api/events/NOCODE/export/csv")
         assert response.status_code == 401
 
-    def test_export_csv_not_owner(
-        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
-    ):
+    def test_export_csv_not_owner(self, client: TestClient, auth_headers: dict, other_event: Event):
         """Test exporting event you don't own fails."""
-        # Create another user and their event
-
-        other_user = User(
-            username="otheruser",
-            password_hash=get_password_hash("otherpassword"),
-        )
-        db.add(other_user)
-        db.flush()
-
-        other_event = Event(
-            code="OTHER1",
-            name="Other User Event",
-            created_by_user_id=other_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-        )
-        db.add(other_event)
-        db.commit()
-
         response = client.get(
             f"/api/events/{other_event.code}/export/csv",
             headers=auth_headers,
         )
         assert response.status_code == 404
 
-    def test_export_csv_expired_event(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
+    @pytest.mark.parametrize("event_fixture", ["expired_event", "archived_event"])
+    def test_export_csv_inactive_event(
+        self,
+        request: pytest.FixtureRequest,
+        client: TestClient,
+        auth_headers: dict,
+        event_fixture: str,
     ):
-        """Test that owner can export CSV for expired events."""
-        expired_event = Event(
-            code="EXPCSV",
-            name="Expired CSV Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
+        """Test that owner can export CSV for expired and archived events."""
+        event = request.getfixturevalue(event_fixture)
         response = client.get(
-            f"/api/events/{expired_event.code}/export/csv",
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-
-    def test_export_csv_archived_event(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
-    ):
-        """Test that owner can export CSV for archived events."""
-        archived_event = Event(
-            code="ARCSV1",
-            name="Archived CSV Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-            archived_at=utcnow(),
-        )
-        db.add(archived_event)
-        db.commit()
-
-        response = client.get(
-            f"/api/events/{archived_event.code}/export/csv",
+            f"/api/events/{event.code}/export/csv",
             headers=auth_headers,
         )
         assert response.status_code == 200
@@ -623,11 +625,10 @@ class TestCsvExport:
             headers=auth_headers,
         )
         assert response.status_code == 200
-        content = response.text
         # Should have header row but no data rows
-        assert "Request ID" in content
-        lines = content.strip().split("\n")
-        assert len(lines) == 1  # Just the header
+        header, *rows = _csv_rows(response)
+        assert "Request ID" in header
+        assert rows == []
 
 
 class TestDisplaySettings:
@@ -646,9 +647,9 @@ class TestDisplaySettings:
         assert data["status"] == "ok"
         assert "now_playing_hidden" in data
 
-    def test_get_display_settings_no_auth(self, client: TestClient, test_event: Event):
+    def test_get_display_settings_no_auth(self, client: TestClient):
         """Test getting display settings without auth fails."""
-        response = client.get(f"/api/events/{test_event.code}/display-settings")
+        response = client.get("/api/events/NOCODE/display-settings")
         assert response.status_code == 401
 
     def test_update_display_settings_hide(
@@ -669,8 +670,6 @@ class TestDisplaySettings:
         self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
     ):
         """Test showing now playing via display settings."""
-        from app.models.now_playing import NowPlaying
-
         # First hide it
         now_playing = NowPlaying(
             event_id=test_event.id,
@@ -679,7 +678,7 @@ class TestDisplaySettings:
             manual_hide_now_playing=True,
         )
         db.add(now_playing)
-        db.commit()
+        db.flush()
 
         response = client.patch(
             f"/api/events/{test_event.code}/display-settings",
@@ -695,10 +694,10 @@ class TestDisplaySettings:
         db.refresh(now_playing)
         assert now_playing.last_shown_at is not None
 
-    def test_update_display_settings_no_auth(self, client: TestClient, test_event: Event):
+    def test_update_display_settings_no_auth(self, client: TestClient):
         """Test updating display settings without auth fails."""
         response = client.patch(
-            f"/api/events/{test_event.code}/display-settings",
+            "/api/events/NOCODE/display-settings",
             json={"now_playing_hidden": True},
         )
         assert response.status_code == 401
@@ -712,8 +711,6 @@ class TestDisplaySettings:
         return now_playing_hidden=False (the DJ's intent), not True (the computed
         kiosk state that factors in empty title).
         """
-        from app.models.now_playing import NowPlaying
-
         # Create a NowPlaying with empty title (no track) but manual_hide=False
         now_playing = NowPlaying(
             event_id=test_event.id,
@@ -722,7 +719,7 @@ class TestDisplaySettings:
             manual_hide_now_playing=False,
         )
         db.add(now_playing)
-        db.commit()
+        db.flush()
 
         response = client.get(
             f"/api/events/{test_event.code}/display-settings",
@@ -766,12 +763,9 @@ class TestDisplaySettings:
         Regression test: previously the toggle would flip back to hidden on the
         next poll when no track was playing.
         """
-        # Toggle to hidden first, then to visible
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": True},
-            headers=auth_headers,
-        )
+        # Start hidden, then toggle to visible
+        set_now_playing_visibility(db, test_event.id, hidden=True)
+
         response = client.patch(
             f"/api/events/{test_event.code}/display-settings",
             json={"now_playing_hidden": False},
@@ -821,82 +815,22 @@ class TestDisplaySettings:
         assert response.status_code == 200
         assert response.json()["now_playing_auto_hide_minutes"] == 30
 
+    @pytest.mark.parametrize(
+        "minutes",
+        [0, 1441],
+        ids=["below_minimum", "above_maximum"],
+    )
     def test_update_display_settings_auto_hide_minutes_validation(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+        self, client: TestClient, auth_headers: dict, test_event: Event, minutes: int
     ):
-        """Test that auto_hide_minutes rejects 0 and 1441."""
-        # 0 is below minimum (1)
+        """Test that auto_hide_minutes outside 1-1440 is rejected."""
         response = client.patch(
             f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": False, "now_playing_auto_hide_minutes": 0},
+            json={"now_playing_hidden": False, "now_playing_auto_hide_minutes": minutes},
             headers=auth_headers,
         )
         assert response.status_code == 422
 
-        # 1441 is above maximum (1440)
-        response = client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": False, "now_playing_auto_hide_minutes": 1441},
-            headers=auth_headers,
-        )
-        assert response.status_code == 422
-
-    def test_update_display_settings_auto_hide_minutes_optional(
-        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
-    ):
-        """Test that omitting auto_hide_minutes doesn't change the value."""
-        # First set it to a custom value
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": False, "now_playing_auto_hide_minutes": 30},
-            headers=auth_headers,
-        )
-
-        # Then update only now_playing_hidden without auto_hide_minutes
-        response = client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": True},
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-
-        # auto_hide_minutes should still be 30
-        response = client.get(
-            f"/api/events/{test_event.code}/display-settings",
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-        assert response.json()["now_playing_auto_hide_minutes"] == 30
-
-    def test_update_auto_hide_only_does_not_change_hidden(
-        self, client: TestClient, auth_headers: dict, test_event: Event
-    ):
-        """Test that PATCH with only auto_hide_minutes does not change now_playing_hidden.
-
-        Regression test for multi-tab race: Tab A toggles visibility to hidden,
-        Tab B saves auto-hide and should not silently undo the visibility change.
-        """
-        # Set hidden=True
-        response = client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": True},
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-        assert response.json()["now_playing_hidden"] is True
-
-        # PATCH with only auto_hide_minutes (simulates Tab B saving auto-hide)
-        response = client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_auto_hide_minutes": 5},
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["now_playing_auto_hide_minutes"] == 5
-        # Hidden should still be True — not reset by the auto-hide PATCH
-        assert data["now_playing_hidden"] is True
-
     def test_kiosk_display_only_defaults_false(
         self, client: TestClient, auth_headers: dict, test_event: Event
     ):
@@ -908,57 +842,84 @@ class TestDisplaySettings:
         assert response.status_code == 200
         assert response.json()["kiosk_display_only"] is False
 
-    def test_update_kiosk_display_only(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+    @pytest.mark.parametrize(
+        "event_fields, update, expected",
+        [
+            pytest.param(
+                {"now_playing_auto_hide_minutes": 30},
+                {"now_playing_hidden": True},
+                {"now_playing_hidden": True, "now_playing_auto_hide_minutes": 30},
+                id="omitted_auto_hide_unchanged",
+            ),
+            pytest.param(
+                {},
+                {"kiosk_display_only": True},
+                {"kiosk_display_only": True},
+                id="kiosk_display_only_on",
+            ),
+            pytest.param(
+                {"kiosk_display_only": True},
+                {"kiosk_display_only": False},
+                {"kiosk_display_only": False},
+                id="kiosk_display_only_off",
+            ),
+        ],
+    )
+    def test_partial_display_settings_update(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        test_event: Event,
+        db: Session,
+        event_fields: dict,
+        update: dict,
+        expected: dict,
     ):
-        """Test setting kiosk_display_only to true and verifying persistence."""
+        """Test that PATCH changes only the fields it sends and persists them."""
+        for field, value in event_fields.items():
+            setattr(test_event, field, value)
+        db.flush()
+
         response = client.patch(
             f"/api/events/{test_event.code}/display-settings",
-            json={"kiosk_display_only": True},
+            json=update,
             headers=auth_headers,
         )
         assert response.status_code == 200
-        assert response.json()["kiosk_display_only"] is True
+        data = response.json()
+        assert {field: data[field] for field in expected} == expected
 
-        # Verify it persists on GET
-        response = client.get(
-            f"/api/events/{test_event.code}/display-settings",
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-        assert response.json()["kiosk_display_only"] is True
+        # Stored, not just echoed back (now_playing_hidden lives on NowPlaying)
+        db.refresh(test_event)
+        for field, value in expected.items():
+            if field != "now_playing_hidden":
+                assert getattr(test_event, field) == value
 
-    def test_kiosk_display_only_toggle_off(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+    def test_auto_hide_only_update_keeps_hidden(
+        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
     ):
-        """Test toggling kiosk_display_only back to false."""
-        # Enable
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"kiosk_display_only": True},
-            headers=auth_headers,
-        )
-        # Disable
+        """Test that saving only auto-hide does not undo a hide from another tab."""
+        # Multi-tab race: Tab A hid now playing, then Tab B saves only auto-hide
+        set_now_playing_visibility(db, test_event.id, hidden=True)
+
         response = client.patch(
             f"/api/events/{test_event.code}/display-settings",
-            json={"kiosk_display_only": False},
+            json={"now_playing_auto_hide_minutes": 5},
             headers=auth_headers,
         )
         assert response.status_code == 200
-        assert response.json()["kiosk_display_only"] is False
+        data = response.json()
+        assert data["now_playing_hidden"] is True
+        assert data["now_playing_auto_hide_minutes"] == 5
 
     def test_kiosk_display_only_does_not_affect_other_settings(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
     ):
-        """Test that toggling kiosk_display_only doesn't change other display settings."""
-        # Set some other settings first
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"now_playing_hidden": True, "now_playing_auto_hide_minutes": 20},
-            headers=auth_headers,
-        )
+        """Test that toggling kiosk_display_only leaves the other settings alone."""
+        set_now_playing_visibility(db, test_event.id, hidden=True)
+        test_event.now_playing_auto_hide_minutes = 20
+        db.flush()
 
-        # Toggle kiosk_display_only
         response = client.patch(
             f"/api/events/{test_event.code}/display-settings",
             json={"kiosk_display_only": True},
@@ -971,26 +932,9 @@ class TestDisplaySettings:
         assert data["now_playing_auto_hide_minutes"] == 20
 
     def test_update_display_settings_not_owner(
-        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
+        self, client: TestClient, auth_headers: dict, other_event: Event
     ):
         """Test updating display settings for event you don't own fails."""
-
-        other_user = User(
-            username="otheruser_display",
-            password_hash=get_password_hash("otherpassword"),
-        )
-        db.add(other_user)
-        db.flush()
-
-        other_event = Event(
-            code="OTHER3",
-            name="Other User Event",
-            created_by_user_id=other_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-        )
-        db.add(other_event)
-        db.commit()
-
         response = client.patch(
             f"/api/events/{other_event.code}/display-settings",
             json={"now_playing_hidden": True},
@@ -1021,63 +965,39 @@ class TestRequestsOpen:
         assert response.status_code == 200
         assert response.json()["requests_open"] is False
 
-    def test_submit_request_when_closed(
-        self, client: TestClient, auth_headers: dict, test_event: Event
-    ):
+    def test_submit_request_when_closed(self, client: TestClient, requests_closed_event: Event):
         """Test submitting a request when requests are closed returns 403."""
-        # Close requests
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"requests_open": False},
-            headers=auth_headers,
-        )
-
-        # Try to submit a request
         response = client.post(
-            f"/api/events/{test_event.code}/requests",
+            f"/api/events/{requests_closed_event.code}/requests",
             json={"artist": "Test Artist", "title": "Test Song"},
         )
         assert response.status_code == 403
         assert response.json()["detail"]
 
     def test_submit_request_when_reopened(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+        self, client: TestClient, auth_headers: dict, requests_closed_event: Event
     ):
         """Test that closing then reopening requests allows submission."""
-        # Close requests
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"requests_open": False},
-            headers=auth_headers,
-        )
-
         # Reopen requests
         client.patch(
-            f"/api/events/{test_event.code}/display-settings",
+            f"/api/events/{requests_closed_event.code}/display-settings",
             json={"requests_open": True},
             headers=auth_headers,
         )
 
         # Submit should succeed
         response = client.post(
-            f"/api/events/{test_event.code}/requests",
+            f"/api/events/{requests_closed_event.code}/requests",
             json={"artist": "Test Artist", "title": "Test Song"},
         )
         assert response.status_code == 200
 
     def test_kiosk_display_when_requests_closed(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+        self, client: TestClient, requests_closed_event: Event
     ):
         """Test kiosk endpoint still returns 200 with requests_open: false."""
-        # Close requests
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"requests_open": False},
-            headers=auth_headers,
-        )
-
         # Kiosk should still work (not 410)
-        response = client.get(f"/api/public/events/{test_event.code}/display")
+        response = client.get(f"/api/public/events/{requests_closed_event.code}/display")
         assert response.status_code == 200
         data = response.json()
         assert data["requests_open"] is False
@@ -1102,53 +1022,39 @@ class TestRequestsOpen:
 class TestKioskDisplayNowPlayingHidden:
     """Tests for now_playing_hidden field in kiosk display response."""
 
-    def test_kiosk_display_includes_now_playing_hidden(self, client: TestClient, test_event: Event):
-        """Test that kiosk display includes now_playing_hidden field."""
-        response = client.get(f"/api/public/events/{test_event.code}/display")
-        assert response.status_code == 200
-        data = response.json()
-        assert "now_playing_hidden" in data
-
-    def test_kiosk_display_hidden_when_manual_hide(
-        self, client: TestClient, test_event: Event, db: Session
-    ):
-        """Test that kiosk display shows hidden when manual_hide is true."""
-        from app.models.now_playing import NowPlaying
-
-        now_playing = NowPlaying(
-            event_id=test_event.id,
-            title="Test Track",
-            artist="Test Artist",
-            manual_hide_now_playing=True,
-        )
-        db.add(now_playing)
-        db.commit()
-
-        response = client.get(f"/api/public/events/{test_event.code}/display")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["now_playing_hidden"] is True
-
-    def test_kiosk_display_visible_when_track_playing(
-        self, client: TestClient, test_event: Event, db: Session
+    @pytest.mark.parametrize(
+        "manual_hide, expected_hidden",
+        [(None, True), (True, True), (False, False)],
+        ids=["no_now_playing", "manual_hide", "track_playing"],
+    )
+    def test_kiosk_display_now_playing_hidden(
+        self,
+        client: TestClient,
+        test_event: Event,
+        db: Session,
+        now: datetime,
+        manual_hide: bool | None,
+        expected_hidden: bool,
     ):
-        """Test that kiosk display shows visible when track is playing."""
-        from app.models.now_playing import NowPlaying
+        """Test the kiosk display's now_playing_hidden flag.
 
-        now_playing = NowPlaying(
-            event_id=test_event.id,
-            title="Test Track",
-            artist="Test Artist",
-            started_at=utcnow(),
-            manual_hide_now_playing=False,
-        )
-        db.add(now_playing)
-        db.commit()
+        With no NowPlaying row there is nothing to show; with a playing track
+        the DJ's manual hide setting decides.
+        """
+        if manual_hide is not None:
+            now_playing = NowPlaying(
+                event_id=test_event.id,
+                title="Test Track",
+                artist="Test Artist",
+                started_at=now,
+                manual_hide_now_playing=manual_hide,
+            )
+            db.add(now_playing)
+            db.flush()
 
         response = client.get(f"/api/public/events/{test_event.code}/display")
         assert response.status_code == 200
-        data = response.json()
-        assert data["now_playing_hidden"] is False
+        assert response.json()["now_playing_hidden"] is expected_hidden
 
 
 class TestKioskDisplayOnly:
@@ -1163,103 +1069,75 @@ class TestKioskDisplayOnly:
         assert data["kiosk_display_only"] is False
 
     def test_kiosk_display_only_reflects_setting(
-        self, client: TestClient, auth_headers: dict, test_event: Event
+        self, client: TestClient, db: Session, test_event: Event
     ):
         """Test that kiosk display endpoint reflects the display-only setting."""
-        # Enable display-only mode
-        client.patch(
-            f"/api/events/{test_event.code}/display-settings",
-            json={"kiosk_display_only": True},
-            headers=auth_headers,
-        )
+        test_event.kiosk_display_only = True
+        db.flush()
 
-        # Check public kiosk endpoint
         response = client.get(f"/api/public/events/{test_event.code}/display")
         assert response.status_code == 200
         assert response.json()["kiosk_display_only"] is True
 
 
+@pytest.mark.slow
 class TestPlayHistoryCsvExport:
     """Tests for play history CSV export functionality."""
 
     def test_export_play_history_csv_success(
-        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        test_event: Event,
+        add_play_history: PlayHistoryFactory,
     ):
         """Test exporting play history as CSV."""
-        from app.models.play_history import PlayHistory
-
-        # Add play history entries
-        entry1 = PlayHistory(
-            event_id=test_event.id,
-            title="First Song",
-            artist="Artist One",
-            album="Album One",
-            source="stagelinq",
-            matched_request_id=None,
-            started_at=utcnow(),
-            ended_at=utcnow(),
-            play_order=1,
+        add_play_history(
+            [
+                {
+                    "title": "First Song",
+                    "artist": "Artist One",
+                    "album": "Album One",
+                    "source": "stagelinq",
+                },
+                {
+                    "title": "Second Song",
+                    "artist": "Artist Two",
+                    "source": "manual",
+                    "matched_request_id": 42,
+                    "ended_at": None,
+                },
+            ]
         )
-        entry2 = PlayHistory(
-            event_id=test_event.id,
-            title="Second Song",
-            artist="Artist Two",
-            album=None,
-            source="manual",
-            matched_request_id=42,
-            started_at=utcnow(),
-            ended_at=None,
-            play_order=2,
-        )
-        db.add_all([entry1, entry2])
-        db.commit()
 
         response = client.get(
             f"/api/events/{test_event.code}/export/play-history/csv",
             headers=auth_headers,
         )
         assert response.status_code == 200
-        assert response.headers["content-type"] == "text/csv; charset=utf-8"
-        assert "attachment" in response.headers["content-disposition"]
-        assert "play_history" in response.headers["content-disposition"]
+        headers = response.headers
+        assert headers["content-type"] == "text/csv; charset=utf-8"
+        disposition = headers["content-disposition"]
+        assert disposition.startswith("attachment;")
+        assert "play_history" in disposition
 
         # Verify CSV content
-        content = response.text
-        assert "Title" in content
-        assert "Artist" in content
-        assert "Source" in content
-        assert "Was Requested" in content
-        assert "First Song" in content
-        assert "Second Song" in content
-        assert "Live" in content  # stagelinq -> Live
-        assert "Manual" in content  # manual -> Manual
-
-    def test_export_play_history_csv_no_auth(self, client: TestClient, test_event: Event):
+        header, *rows = _csv_rows(response)
+        assert {"Title", "Artist", "Source", "Was Requested"} <= set(header)
+        by_title = {row[header.index("Title")]: dict(zip(header, row)) for row in rows}
+        assert by_title.keys() == {"First Song", "Second Song"}
+        assert by_title["First Song"]["Source"] == "Live"  # stagelinq -> Live
+        assert by_title["Second Song"]["Source"] == "Manual"  # manual -> Manual
+
+    def test_export_play_history_csv_no_auth(self, client: TestClient):
         """Test exporting play history without auth fails."""
-        response = client.get(f"/api/events/{test_event.code}/export/play-history/csv")
+        response = client.get("/api/events/NOCODE/export/play-history/csv")
         assert response.status_code == 401
 
     def test_export_play_history_csv_not_owner(
-        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
+        self, client: TestClient, auth_headers: dict, other_event: Event
     ):
         """Test exporting play history for event you don't own fails."""
-
-        other_user = User(
-            username="otheruser2",
-            password_hash=get_password_hash("otherpassword"),
-        )
-        db.add(other_user)
-        db.flush()
-
-        other_event = Event(
-            code="OTHER2",
-            name="Other User Event",
-            created_by_user_id=other_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-        )
-        db.add(other_event)
-        db.commit()
-
         response = client.get(
             f"/api/events/{other_event.code}/export/play-history/csv",
             headers=auth_headers,
@@ -1267,37 +1145,26 @@ class TestPlayHistoryCsvExport:
         assert response.status_code == 404
 
     def test_export_play_history_csv_includes_both_sources(
-        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        test_event: Event,
+        add_play_history: PlayHistoryFactory,
     ):
         """Test that export includes both stagelinq and manual sources."""
-        from app.models.play_history import PlayHistory
-
-        # Add stagelinq entry (live DJ tracking)
-        stagelinq_entry = PlayHistory(
-            event_id=test_event.id,
-            title="Live Track",
-            artist="DJ Artist",
-            album=None,
-            source="stagelinq",
-            matched_request_id=None,
-            started_at=utcnow(),
-            ended_at=utcnow(),
-            play_order=1,
-        )
-        # Add manual entry (DJ marked request as played)
-        manual_entry = PlayHistory(
-            event_id=test_event.id,
-            title="Requested Track",
-            artist="Requested Artist",
-            album=None,
-            source="manual",
-            matched_request_id=99,
-            started_at=utcnow(),
-            ended_at=utcnow(),
-            play_order=2,
+        add_play_history(
+            [
+                # Live DJ tracking
+                {"title": "Live Track", "artist": "DJ Artist", "source": "stagelinq"},
+                # DJ marked request as played
+                {
+                    "title": "Requested Track",
+                    "artist": "Requested Artist",
+                    "source": "manual",
+                    "matched_request_id": 99,
+                },
+            ]
         )
-        db.add_all([stagelinq_entry, manual_entry])
-        db.commit()
 
         response = client.get(
             f"/api/events/{test_event.code}/export/play-history/csv",
@@ -1305,47 +1172,34 @@ class TestPlayHistoryCsvExport:
         )
         assert response.status_code == 200
 
-        content = response.text
-        lines = content.strip().split("\n")
-        # Header + 2 data rows
-        assert len(lines) == 3
+        header, *rows = _csv_rows(response)
+        assert len(rows) == 2
 
         # Verify both sources are present
-        assert "Live" in content  # stagelinq -> Live
-        assert "Manual" in content  # manual -> Manual
+        sources = {row[header.index("Source")] for row in rows}
+        assert sources == {"Live", "Manual"}  # stagelinq -> Live, manual -> Manual
 
     def test_export_play_history_csv_was_requested_column(
-        self, client: TestClient, auth_headers: dict, test_event: Event, db: Session
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        test_event: Event,
+        add_play_history: PlayHistoryFactory,
     ):
         """Test that Was Requested column shows Yes/No correctly."""
-        from app.models.play_history import PlayHistory
-
-        # Entry with matched request
-        requested = PlayHistory(
-            event_id=test_event.id,
-            title="Requested Song",
-            artist="Artist",
-            album=None,
-            source="stagelinq",
-            matched_request_id=42,
-            started_at=utcnow(),
-            ended_at=utcnow(),
-            play_order=1,
-        )
-        # Entry without matched request
-        not_requested = PlayHistory(
-            event_id=test_event.id,
-            title="DJ Choice",
-            artist="Artist",
-            album=None,
-            source="stagelinq",
-            matched_request_id=None,
-            started_at=utcnow(),
-            ended_at=utcnow(),
-            play_order=2,
+        add_play_history(
+            [
+                # Entry with matched request
+                {
+                    "title": "Requested Song",
+                    "artist": "Artist",
+                    "source": "stagelinq",
+                    "matched_request_id": 42,
+                },
+                # Entry without matched request
+                {"title": "DJ Choice", "artist": "Artist", "source": "stagelinq"},
+            ]
         )
-        db.add_all([requested, not_requested])
-        db.commit()
 
         response = client.get(
             f"/api/events/{test_event.code}/export/play-history/csv",
@@ -1353,10 +1207,11 @@ class TestPlayHistoryCsvExport:
         )
         assert response.status_code == 200
 
-        content = response.text
-        # Both Yes and No should be present
-        assert "Yes" in content
-        assert "No" in content
+        header, *rows = _csv_rows(response)
+        was_requested = {
+            row[header.index("Title")]: row[header.index("Was Requested")] for row in rows
+        }
+        assert was_requested == {"Requested Song": "Yes", "DJ Choice": "No"}
 
     def test_export_play_history_csv_empty(
         self, client: TestClient, auth_headers: dict, test_event: Event
@@ -1367,47 +1222,23 @@ class TestPlayHistoryCsvExport:
             headers=auth_headers,
         )
         assert response.status_code == 200
-        content = response.text
         # Should have header row but no data rows
-        assert "Title" in content
-        lines = content.strip().split("\n")
-        assert len(lines) == 1  # Just the header
-
-    def test_export_play_history_csv_expired_event(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
+        header, *rows = _csv_rows(response)
+        assert "Title" in header
+        assert rows == []
+
+    @pytest.mark.parametrize("event_fixture", ["expired_event", "archived_event"])
+    def test_export_play_history_csv_inactive_event(
+        self,
+        request: pytest.FixtureRequest,
+        client: TestClient,
+        auth_headers: dict,
+        event_fixture: str,
     ):
-        """Test that owner can export play history CSV for expired events."""
-        expired_event = Event(
-            code="EXPHIS",
-            name="Expired Play History Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
+        """Test that owner can export play history CSV for expired and archived events."""
+        event = request.getfixturevalue(event_fixture)
         response = client.get(
-            f"/api/events/{expired_event.code}/export/play-history/csv",
-            headers=auth_headers,
-        )
-        assert response.status_code == 200
-
-    def test_export_play_history_csv_archived_event(
-        self, client: TestClient, auth_headers: dict, db: Session, test_user: User
-    ):
-        """Test that owner can export play history CSV for archived events."""
-        archived_event = Event(
-            code="ARCHIS",
-            name="Archived Play History Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-            archived_at=utcnow(),
-        )
-        db.add(archived_event)
-        db.commit()
-
-        response = client.get(
-            f"/api/events/{archived_event.code}/export/play-history/csv",
+            f"/api/events/{event.code}/export/play-history/csv",
             headers=auth_headers,
         )
         assert response.status_code == 200
@@ -1416,55 +1247,41 @@ class TestPlayHistoryCsvExport:
 class TestEventSearch:
     """Tests for GET /api/events/{code}/search endpoint."""
 
-    @patch("app.services.spotify.search_songs")
-    def test_event_search_returns_spotify_results(
-        self, mock_search, client: TestClient, test_event: Event
-    ):
-        """Basic search returns Spotify results."""
-        mock_search.return_value = [
-            SearchResult(
-                title="Strobe",
-                artist="deadmau5",
-                album="For Lack of a Better Name",
-                popularity=72,
-                spotify_id="sp_strobe",
-                source="spotify",
-            )
-        ]
-
-        response = client.get(f"/api/events/{test_event.code}/search?q=deadmau5")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 1
-        assert data[0]["title"] == "Strobe"
-        assert data[0]["source"] == "spotify"
-
+    @pytest.mark.parametrize(
+        "beatport_linked, expected_titles",
+        [
+            (False, {"spotify": "Strobe"}),
+            (True, {"spotify": "Strobe", "beatport": "Acid Phase"}),
+        ],
+        ids=["spotify_only", "with_beatport"],
+    )
     @patch("app.services.beatport.search_beatport_tracks")
     @patch("app.services.spotify.search_songs")
-    def test_event_search_includes_beatport_fallback(
-        self, mock_spotify, mock_beatport, client: TestClient, db: Session, test_user: User
+    def test_event_search_sources(
+        self,
+        mock_spotify,
+        mock_beatport,
+        client: TestClient,
+        db: Session,
+        test_user: User,
+        test_event: Event,
+        now: datetime,
+        beatport_linked: bool,
+        expected_titles: dict[str, str],
     ):
-        """Event with Beatport-linked owner includes Beatport results."""
-        # Give test_user Beatport tokens
-        test_user.beatport_access_token = "bp_token"
-        test_user.beatport_refresh_token = "bp_refresh"
-        test_user.beatport_token_expires_at = utcnow() + timedelta(hours=1)
-        db.flush()
-
-        event = Event(
-            code="BPSRCH",
-            name="BP Search Test",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-            beatport_sync_enabled=True,
-        )
-        db.add(event)
-        db.commit()
+        """Search returns Spotify results, plus Beatport only when the owner linked it."""
+        if beatport_linked:
+            test_user.beatport_access_token = "bp_token"
+            test_user.beatport_refresh_token = "bp_refresh"
+            test_user.beatport_token_expires_at = now + timedelta(hours=1)
+            test_event.beatport_sync_enabled = True
+            db.flush()
 
         mock_spotify.return_value = [
             SearchResult(
                 title="Strobe",
                 artist="deadmau5",
+                album="For Lack of a Better Name",
                 popularity=72,
                 spotify_id="sp_strobe",
                 source="spotify",
@@ -1479,48 +1296,15 @@ class TestEventSearch:
             )
         ]
 
-        response = client.get(f"/api/events/{event.code}/search?q=acid+phase")
+        response = client.get(f"/api/events/{test_event.code}/search?q=strobe")
         assert response.status_code == 200
         data = response.json()
-        assert len(data) == 2
-        sources = [r["source"] for r in data]
-        assert "spotify" in sources
-        assert "beatport" in sources
+        assert {r["source"]: r["title"] for r in data} == expected_titles
+        assert len(data) == len(expected_titles)
+        assert mock_beatport.called is beatport_linked
 
-    @patch("app.services.spotify.search_songs")
-    def test_event_search_no_beatport_when_not_linked(
-        self, mock_search, client: TestClient, test_event: Event
-    ):
-        """DJ without Beatport linked -> Spotify only, no errors."""
-        mock_search.return_value = [
-            SearchResult(
-                title="Levels",
-                artist="Avicii",
-                popularity=85,
-                spotify_id="sp_levels",
-                source="spotify",
-            )
-        ]
-
-        response = client.get(f"/api/events/{test_event.code}/search?q=levels")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 1
-        assert all(r["source"] == "spotify" for r in data)
-
-    def test_event_search_expired_event_returns_410(
-        self, client: TestClient, db: Session, test_user: User
-    ):
+    def test_event_search_expired_event_returns_410(self, client: TestClient, expired_event: Event):
         """Expired event returns 410 for search."""
-        expired_event = Event(
-            code="EXPSRC",
-            name="Expired Search Event",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() - timedelta(hours=1),
-        )
-        db.add(expired_event)
-        db.commit()
-
         response = client.get(f"/api/events/{expired_event.code}/search?q=test")
         assert response.status_code == 410
 
@@ -1542,22 +1326,13 @@ class TestEventSearch:
 
     @patch("app.services.tidal.search_tidal_tracks")
     def test_event_search_tidal_primary(
-        self, mock_tidal, client: TestClient, db: Session, test_user: User
+        self, mock_tidal, client: TestClient, db: Session, test_user: User, make_event: EventFactory
     ):
         """Tidal is used as primary source when owner has Tidal linked."""
-        from app.schemas.tidal import TidalSearchResult
-
         test_user.tidal_access_token = "tidal_token"
-        db.flush()
 
-        event = Event(
-            code="TDSRCH",
-            name="Tidal Search Test",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-        )
-        db.add(event)
-        db.commit()
+        event = make_event("TDSRCH", name="Tidal Search Test")
+        db.flush()
 
         mock_tidal.return_value = [
             TidalSearchResult(
@@ -1581,20 +1356,19 @@ class TestEventSearch:
     @patch("app.services.spotify.search_songs")
     @patch("app.services.tidal.search_tidal_tracks")
     def test_event_search_spotify_fallback_when_tidal_empty(
-        self, mock_tidal, mock_spotify, client: TestClient, db: Session, test_user: User
+        self,
+        mock_tidal,
+        mock_spotify,
+        client: TestClient,
+        db: Session,
+        test_user: User,
+        make_event: EventFactory,
     ):
         """Spotify is used when Tidal returns no results."""
         test_user.tidal_access_token = "tidal_token"
-        db.flush()
 
-        event = Event(
-            code="FBSRCH",
-            name="Fallback Search Test",
-            created_by_user_id=test_user.id,
-            expires_at=utcnow() + timedelta(hours=6),
-        )
-        db.add(event)
-        db.commit()
+        event = make_event("FBSRCH", name="Fallback Search Test")
+        db.flush()
 
         mock_tidal.return_value = []
         mock_spotify.return_value = [
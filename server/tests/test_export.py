@@ -6,6 +6,7 @@ from unittest.mock import MagicMock
 from app.services.export import (
     export_requests_to_csv,
     generate_export_filename,
+    iter_requests_csv,
     sanitize_csv_value,
     sanitize_filename,
 )
@@ -205,6 +206,36 @@ class TestExportRequestsToCsv:
         lines = csv_content.strip().split("\n")
         assert len(lines) == 6  # Header + 5 data rows
 
+    def test_iter_yields_one_chunk_per_row(self):
+        """Test that the streaming variant yields the header and each row separately."""
+        event = MagicMock()
+
+        requests = []
+        for i in range(3):
+            req = MagicMock()
+            req.id = i
+            req.song_title = f"Song {i}"
+            req.artist = "Artist"
+            req.genre = None
+            req.bpm = None
+            req.musical_key = None
+            req.vote_count = 0
+            req.status = "new"
+            req.note = None
+            req.source = "manual"
+            req.source_url = None
+            req.artwork_url = None
+            req.created_at = None
+            req.updated_at = None
+            requests.append(req)
+
+        chunks = list(iter_requests_csv(event, requests))
+
+        assert len(chunks) == 4  # Header + 3 data rows
+        assert chunks[0].startswith("Request ID,")
+        assert chunks[2].startswith("1,Song 1,")
+        assert "".join(chunks) == export_requests_to_csv(event, requests)
+
     def test_escapes_csv_special_characters(self):
         """Test that CSV special characters are properly escaped."""
         event = MagicMock()